@@ -69,11 +69,13 @@ def _parse_single_salary(salary_str):
 
 # Add minimum and maximum monthly salaries to dataframe
 def process_salaries(df):
-    df[[_MIN_SALARY_COL, _MAX_SALARY_COL, _AVG_SALARY_COL]] = df['Salary'].apply(
-        lambda x: pd.Series(_parse_single_salary(x)))
+    salary_cols = [_MIN_SALARY_COL, _MAX_SALARY_COL, _AVG_SALARY_COL]
+    # Built from a list, so that an empty dataframe still gets all three columns
+    df[salary_cols] = pd.DataFrame(df['Salary'].apply(_parse_single_salary).tolist(), index=df.index,
+                                   columns=salary_cols)
 
 
-def draw_salaries_chart(df, locale = "en"):
+def draw_salaries_chart(df, locale = "en", save_path=""):
     salaries = df[_AVG_SALARY_COL].dropna().tolist()
 
     q25 = np.percentile(salaries, 25)
@@ -129,4 +131,9 @@ def draw_salaries_chart(df, locale = "en"):
 
     # Show legend
     plt.legend()
-    plt.show()
+    # Save the chart to a file instead of showing it when a path is given
+    if save_path != "":
+        plt.savefig(save_path, bbox_inches='tight')
+        plt.close()
+    else:
+        plt.show()
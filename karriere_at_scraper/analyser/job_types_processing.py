@@ -3,7 +3,7 @@ from matplotlib import pyplot as plt
 from karriere_at_scraper.analyser.charts_locales import ChartsLocale
 
 
-def draw_employment_types_chart(df, locale = "en"):
+def draw_employment_types_chart(df, locale = "en", save_path=""):
     locale = ChartsLocale(locale)
 
     empl_df = df.copy()
@@ -31,4 +31,9 @@ def draw_employment_types_chart(df, locale = "en"):
     for i, (count, percentage) in enumerate(zip(employment_counts, percentages)):
         plt.text(i, count + 0.1, f'{count} ({percentage:.1f}%)', ha='center', va='bottom')
 
-    plt.show()
+    # Save the chart to a file instead of showing it when a path is given
+    if save_path != "":
+        plt.savefig(save_path, bbox_inches='tight')
+        plt.close()
+    else:
+        plt.show()
@@ -0,0 +1,334 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from karriere_at_scraper.analyser import process_salaries, draw_salaries_chart, draw_employment_types_chart
+from karriere_at_scraper.scraper import KarriereAtScraper
+
+# Default manifest values, every key can be overridden in the manifest file
+DEFAULTS = {
+    "engine": "firefox",
+    "driver_dir": "",
+    "workers": 1,
+    "headless": True,
+    "use_proxy": False,
+    "google_proxy": False,
+    "custom_proxy": "",
+    "wait_timer": 1,
+    "limit": 9999,
+    "remove_duplicates": True,
+    "output": "",
+    "process_salaries": False,
+    "charts_dir": "",
+    "charts_locale": "en",
+}
+
+# Keys of a single search in the manifest
+SEARCH_KEYS = {"jobs", "locations", "limit"}
+
+# Supported extensions of the output file
+OUTPUT_EXTENSIONS = (".csv", ".json")
+
+
+def load_manifest(path):
+    """
+    Reads a JSON or YAML manifest and fills in the default values
+    :param path: path to a .json, .yaml or .yml file
+    :return: a dict with the manifest settings
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML manifests require PyYAML. Install it with 'pip install pyyaml'.")
+            try:
+                manifest = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"The manifest {path} is not a valid YAML file: {e}")
+        else:
+            try:
+                manifest = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"The manifest {path} is not a valid JSON file: {e}")
+
+    _validate_manifest(manifest, path)
+
+    return {**DEFAULTS, **manifest}
+
+
+def _is_positive_int(value):
+    # bool is a subclass of int, but "limit: true" is surely a mistake
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+def _is_strings(value):
+    if isinstance(value, str):
+        return value.strip() != ""
+    return (isinstance(value, list) and len(value) > 0
+            and all(isinstance(item, str) and item.strip() != "" for item in value))
+
+
+def check_output(output):
+    """
+    Raises a ValueError if the results can't be saved to the output file, so that it fails before scraping
+    :param output: path to the output file, an empty string for a generated name
+    """
+    if output == "":
+        return
+    if not output.lower().endswith(OUTPUT_EXTENSIONS):
+        raise ValueError(f"The output {output} has to be a {" or ".join(OUTPUT_EXTENSIONS)} file.")
+    output_dir = os.path.dirname(output) or "."
+    if not os.path.isdir(output_dir):
+        raise ValueError(f"The directory {output_dir} of the output {output} does not exist.")
+
+
+def _validate_manifest(manifest, path):
+    """
+    Raises a ValueError if the manifest has unknown keys or malformed searches
+    :param manifest: a dict read from the manifest file
+    :param path: path to the manifest, used in error messages
+    """
+    if not isinstance(manifest, dict):
+        raise ValueError(f"The manifest {path} has to be a mapping of settings.")
+
+    unknown_keys = set(manifest) - set(DEFAULTS) - {"searches"}
+    if unknown_keys:
+        raise ValueError(f"The manifest {path} has unknown keys: {", ".join(sorted(unknown_keys))}. "
+                         f"Allowed keys are: searches, {", ".join(DEFAULTS)}.")
+
+    for key in ("workers", "limit"):
+        if key in manifest and not _is_positive_int(manifest[key]):
+            raise ValueError(f"The manifest {path} has to have a positive integer '{key}', got {manifest[key]!r}.")
+
+    if "output" in manifest:
+        if not isinstance(manifest["output"], str):
+            raise ValueError(f"The manifest {path} has to have a string 'output', got {manifest['output']!r}.")
+        if manifest["output"] != "" and not manifest["output"].lower().endswith(OUTPUT_EXTENSIONS):
+            raise ValueError(f"The manifest {path} has to have a {" or ".join(OUTPUT_EXTENSIONS)} 'output', "
+                             f"got {manifest['output']!r}.")
+
+    searches = manifest.get("searches")
+    if not isinstance(searches, list) or len(searches) == 0:
+        raise ValueError(f"The manifest {path} has to contain a non-empty 'searches' list.")
+
+    for i, search in enumerate(searches, start=1):
+        if not isinstance(search, dict):
+            raise ValueError(f"Search #{i} in {path} has to be a mapping, got {search!r}.")
+        unknown_keys = set(search) - SEARCH_KEYS
+        if unknown_keys:
+            raise ValueError(f"Search #{i} in {path} has unknown keys: {", ".join(sorted(unknown_keys))}.")
+        for key in ("jobs", "locations"):
+            if key not in search:
+                raise ValueError(f"Search #{i} in {path} has no '{key}'.")
+            if not _is_strings(search[key]):
+                raise ValueError(f"Search #{i} in {path} has to have '{key}' as a string or a non-empty list "
+                                 f"of strings, got {search[key]!r}.")
+        if "limit" in search and not _is_positive_int(search["limit"]):
+            raise ValueError(f"Search #{i} in {path} has to have a positive integer 'limit', "
+                             f"got {search['limit']!r}.")
+
+
+def build_units(searches, default_limit=9999):
+    """
+    Expands searches into unique (job, location) pairs, so that every pair is scraped only once
+    :param searches: a list of dicts with "jobs", "locations" and an optional "limit"
+    :param default_limit: a limit for searches without their own one
+    :return: a list of (job, location, limit) tuples
+    """
+    units = {}
+    for search in searches:
+        jobs = search["jobs"]
+        locations = search["locations"]
+        # If a single string is given
+        if isinstance(jobs, str):
+            jobs = [jobs]
+        if isinstance(locations, str):
+            locations = [locations]
+        limit = search.get("limit", default_limit)
+
+        for job in jobs:
+            for location in locations:
+                # The same key the scraper uses for its URLs
+                key = (job.lower().replace(' ', '-'), location.lower().replace(' ', '-'))
+                if key in units:
+                    # Keep the biggest limit of the duplicated searches
+                    units[key] = (units[key][0], units[key][1], max(units[key][2], limit))
+                else:
+                    units[key] = (job, location, limit)
+
+    return list(units.values())
+
+
+def run_manifest(manifest):
+    """
+    Scrapes all the searches of a manifest, every worker keeps its own browser for all of its searches
+    :param manifest: a dict returned by load_manifest
+    :return: a tuple of the combined dataframe, the number of failed searches and True if the run was interrupted
+    """
+    units = build_units(manifest["searches"], manifest["limit"])
+    workers = max(1, min(int(manifest["workers"]), len(units)))
+    print(f"=== {len(units)} unique searches on {workers} worker(s) ===")
+
+    # Idle scrapers, a worker takes one for a search and puts it back afterwards
+    scrapers = queue.Queue()
+    all_scrapers = []
+    for worker in range(workers):
+        # Tag the scrapers' own logs when several of them print at the same time
+        log_prefix = f"(worker {worker + 1}) " if workers > 1 else ""
+        all_scrapers.append(KarriereAtScraper(manifest["engine"], manifest["driver_dir"],
+                                              run_headless=manifest["headless"], use_proxy=manifest["use_proxy"],
+                                              google_proxy=manifest["google_proxy"],
+                                              custom_proxy=manifest["custom_proxy"],
+                                              wait_timer=manifest["wait_timer"], keep_driver=True,
+                                              log_prefix=log_prefix))
+        scrapers.put(all_scrapers[-1])
+
+    # Set on an interrupt, so that searches which are just starting don't open a new browser
+    stopped = threading.Event()
+
+    def scrape(job, location, limit):
+        """Returns the jobs of a search and the error that stopped it, or None if it finished"""
+        if stopped.is_set():
+            return pd.DataFrame([], columns=KarriereAtScraper.DF_COLUMNS), KeyboardInterrupt()
+        scraper = scrapers.get()
+        try:
+            scraper.clear_df()
+            error = None
+            try:
+                scraper.fetch_jobs([job], [location], remove_duplicates=False, length_limit=limit, export=False)
+            except Exception as e:
+                error = e
+            # The jobs parsed before an error are kept as well
+            return scraper.get_df().copy(), error
+        finally:
+            scrapers.put(scraper)
+
+    frames = []
+    failed = 0
+    jobs_found = 0
+    done = 0
+    interrupted = False
+    start_time = time.time()
+
+    # Not a with-block, as its exit would wait for all the queued searches after an interrupt
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(scrape, *unit): unit for unit in units}
+        try:
+            for future in as_completed(futures):
+                done += 1
+                job, location, _ = futures[future]
+                df, error = future.result()
+                frames.append(df)
+                jobs_found += len(df)
+                if error is None:
+                    status = f"+ {job} in {location}: {len(df)} jobs"
+                else:
+                    failed += 1
+                    status = f"- {job} in {location} failed after {len(df)} jobs: {error}"
+
+                elapsed = time.time() - start_time
+                print(f">>> [{done}/{len(units)}] {status} | {jobs_found} jobs in total, "
+                      f"{jobs_found / max(elapsed, 1e-9) * 60:.1f} jobs/min")
+        except KeyboardInterrupt:
+            interrupted = True
+            print(f"! Interrupted, {len(units) - done} searches were not finished")
+    finally:
+        # Drop the queued searches, closing the browsers stops the running ones
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for scraper in all_scrapers:
+            scraper.close_driver()
+
+    if frames:
+        result_df = pd.concat(frames, ignore_index=True)
+    else:
+        result_df = pd.DataFrame([], columns=KarriereAtScraper.DF_COLUMNS)
+
+    if manifest["remove_duplicates"]:
+        result_df = result_df.drop_duplicates(subset="ID", keep='last').reset_index(drop=True)
+
+    return result_df, failed, interrupted
+
+
+def export_results(df, manifest):
+    """
+    Saves the results, the salaries and the charts as requested in the manifest
+    :param df: a dataframe returned by run_manifest
+    :param manifest: a dict returned by load_manifest
+    """
+    if manifest["process_salaries"]:
+        process_salaries(df)
+
+    output = manifest["output"]
+    if output == "":
+        output = f"karriere_at_scraping_am_{datetime.now().strftime('%Y_%m_%d_%H_%M')}.csv"
+    if output.lower().endswith(".json"):
+        df.to_json(output, orient="records", force_ascii=False, indent=2)
+    else:
+        df.to_csv(output)
+    print(f"! Exported {len(df)} jobs to {output}")
+
+    charts_dir = manifest["charts_dir"]
+    if charts_dir != "" and len(df) > 0:
+        os.makedirs(charts_dir, exist_ok=True)
+        draw_employment_types_chart(df, locale=manifest["charts_locale"],
+                                    save_path=os.path.join(charts_dir, "employment_types.png"))
+        # The salaries chart needs processed salaries with at least one known value
+        if manifest["process_salaries"] and df["Average monthly salary"].notna().any():
+            draw_salaries_chart(df, locale=manifest["charts_locale"],
+                                save_path=os.path.join(charts_dir, "salaries.png"))
+        print(f"! Exported charts to {charts_dir}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="karriere-at-scraper",
+                                     description="Scrapes karriere.at for every search of a manifest file.")
+    parser.add_argument("manifest", help="path to a JSON or YAML manifest")
+    parser.add_argument("-w", "--workers", type=int, help="number of parallel browsers, overrides the manifest")
+    parser.add_argument("-o", "--output", help="a .csv or .json output file, overrides the manifest")
+    parser.add_argument("--dry-run", action="store_true", help="only print the unique searches")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = load_manifest(args.manifest)
+    except (OSError, ImportError, ValueError) as e:
+        parser.error(str(e))
+    if args.workers is not None and args.workers < 1:
+        parser.error(f"--workers has to be a positive integer, got {args.workers}.")
+    if args.workers is not None:
+        manifest["workers"] = args.workers
+    if args.output is not None:
+        manifest["output"] = args.output
+    try:
+        check_output(manifest["output"])
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.dry_run:
+        for job, location, limit in build_units(manifest["searches"], manifest["limit"]):
+            print(f"{job} in {location} (limit {limit})")
+        return 0
+
+    df, failed, interrupted = run_manifest(manifest)
+    # The jobs collected before an interrupt are exported as well
+    export_results(df, manifest)
+
+    if interrupted:
+        print(f"=== Interrupted: {len(df)} jobs, {failed} failed searches ===")
+        return 130
+    print(f"=== Finished: {len(df)} jobs, {failed} failed searches ===")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,7 +47,7 @@ class KarriereAtScraper:
     DRIVER_RETRIES = 2
 
     def __init__(self, driver_name, driver_dir, run_headless=True, use_proxy=True, google_proxy=False,
-                 custom_proxy="", wait_timer=1):
+                 custom_proxy="", wait_timer=1, keep_driver=False, log_prefix=""):
         """
         The scraper class
         :param driver_name: Name of your browser: firefox, edge, or chrome
@@ -57,6 +57,8 @@ class KarriereAtScraper:
         :param google_proxy: True if you want to connect with google proxy (availability depends on the third party)
         :param custom_proxy: String with custom proxy url. It wil be used as a part of Selenium '--proxy-server=' parameter
         :param wait_timer: Time in seconds that selenium will wait when looking for elements. 1 second by default.
+        :param keep_driver: True to reuse one browser session across fetch_jobs calls, close it with close_driver()
+        :param log_prefix: String printed before every log line, e.g. to tell parallel scrapers apart
         """
         self.__driver_name = driver_name.upper()
 
@@ -65,6 +67,7 @@ class KarriereAtScraper:
 
         self.__driver_dir = driver_dir
         self.__driver = None
+        self.__driver_ready = False  # True when the driver has passed the start page and the cookies request
         self.__current_df = pd.DataFrame([], columns=self.DF_COLUMNS)
         # Utility values
         self.WAIT_TIMER = wait_timer
@@ -72,6 +75,8 @@ class KarriereAtScraper:
         self.RUN_HEADLESS = run_headless
         self.GOOGLE_PROXY = google_proxy
         self.CUSTOM_PROXY = custom_proxy
+        self.KEEP_DRIVER = keep_driver
+        self.LOG_PREFIX = log_prefix
 
     def get_df(self):
         """Returns current dataframe"""
@@ -93,15 +98,15 @@ class KarriereAtScraper:
         self.__fetch_jobs_data(urls, length_limit)
 
         if len(self.__current_df) == 0:
-            print("! No jobs were found")
+            self.__log("! No jobs were found")
         else:
-            print(f"! {len(self.__current_df)} jobs were found")
+            self.__log(f"! {len(self.__current_df)} jobs were found")
             if export:
                 if csv_name == "":
                     csv_name = (f"karriere_at_scraping_{"_und_".join(jobs_list)}_in_{"_und_".join(locations)}"
                                 f"_am_{datetime.now().strftime('%Y_%m_%d_%H_%M')}.csv").replace(' ', '_')
                 self.__current_df.to_csv(csv_name)
-                print("! Exported data to csv")
+                self.__log("! Exported data to csv")
 
         if remove_duplicates:
             self.__current_df = self.__current_df.drop_duplicates(subset="ID", keep='last')
@@ -119,14 +124,30 @@ class KarriereAtScraper:
         """Removes all the entries from dataframe"""
         self.__current_df = self.__current_df.iloc[0:0]
 
+    def close_driver(self):
+        """Quits the webdriver if it is still running"""
+        if self.__driver:
+            try:
+                self.__driver.quit()
+            except Exception as e:
+                self.__log(f"! Failed to quit the driver: {e}")
+            self.__driver = None
+        self.__driver_ready = False
+
+    def __log(self, *values):
+        """
+        Prints a log line with the log prefix, in a single call so that parallel scrapers don't mix their lines
+        :param values: values to print, separated by spaces
+        """
+        print(self.LOG_PREFIX + " ".join(str(value) for value in values))
+
     def __create_driver(self):
         """
         Creates selenium webdriver
         """
 
         # Check if driver already exists
-        if self.__driver:
-            self.__driver.quit()
+        self.close_driver()
 
         # region Driver setup
         if self.__driver_name == 'FIREFOX':
@@ -147,9 +168,9 @@ class KarriereAtScraper:
             else:
                 proxy_ip = FreeProxy(google=self.GOOGLE_PROXY).get()
             driver_options.add_argument(f"--proxy-server={proxy_ip}")
-            print(f"=== Driver created under the proxy {proxy_ip} ===")
+            self.__log(f"=== Driver created under the proxy {proxy_ip} ===")
         else:
-            print(f"=== Driver created ===")
+            self.__log(f"=== Driver created ===")
         # Updated with the path to WebDriver
         if self.__driver_name == 'FIREFOX':
             service = FirefoxService(self.__driver_dir)
@@ -212,7 +233,7 @@ class KarriereAtScraper:
                 return element
             except StaleElementReferenceException:
                 if attempt < self.DRIVER_RETRIES:
-                    print("Attempt #" + str(attempt + 1))
+                    self.__log("Attempt #" + str(attempt + 1))
                     # Element disappeared from DOM, will retry
                     pass
                 else:
@@ -221,7 +242,7 @@ class KarriereAtScraper:
             except (NoSuchElementException, TimeoutException):
                 return None
             except Exception as e:
-                print(f"Failed to get element of {name}: {e}")
+                self.__log(f"Failed to get element of {name}: {e}")
                 return None
 
         return None
@@ -246,7 +267,7 @@ class KarriereAtScraper:
         except NoSuchElementException:
             return []
         except Exception as e:
-            print(f"! Failed to get elements of {name}: {e}")
+            self.__log(f"! Failed to get elements of {name}: {e}")
             return []
 
     def __get_element_text(self, how, name, default_value=pd.NA, driver=None, hard=False):
@@ -282,7 +303,7 @@ class KarriereAtScraper:
                     # print(f"Element {name} disappeared from DOM after retry while getting text.")
                     return "EXCEPTION"
             except Exception as e:
-                print(f"Exception encountered while getting text of {name}: {e}")
+                self.__log(f"Exception encountered while getting text of {name}: {e}")
                 return "EXCEPTION"
 
         return default_value
@@ -300,7 +321,7 @@ class KarriereAtScraper:
             self.__driver.execute_script("arguments[0].remove();", to_remove)
             return True
         except Exception as e:
-            print(f"! Failed to remove element of {name}: {e}")
+            self.__log(f"! Failed to remove element of {name}: {e}")
             return False
 
     def __deny_cookies(self):
@@ -312,10 +333,10 @@ class KarriereAtScraper:
             element = self.__get_element(By.ID, self.COOKIE_DENY_ID, clickable=True, wait_time=5)
             if element:
                 element.click()
-            print("+ Cookies successfully denied")
+            self.__log("+ Cookies successfully denied")
             return True
         except Exception as e:
-            print("- Error with cookies.", e)
+            self.__log("- Error with cookies.", e)
             return False
 
     def __fetch_jobs_data(self, urls, limit=9999):
@@ -324,24 +345,46 @@ class KarriereAtScraper:
         :param urls: a list of URLs
         :param limit: a hard limit on how many jobs to fetch
         """
-        self.__create_driver()
+        try:
+            # A kept driver has already passed the start page and the cookies request
+            if not (self.KEEP_DRIVER and self.__driver_ready):
+                self.__create_driver()
 
-        self.__driver.get(self.BASE_URL)
+                self.__driver.get(self.BASE_URL)
 
-        # region Wait until the searchbar is loaded and click on empty space to activate the page
-        searchbar_element = self.__get_element(By.ID, self.SEARCHBAR_ID, clickable=True)
-        searchbar_element.click()
-        # endregion
+                # region Wait until the searchbar is loaded and click on empty space to activate the page
+                searchbar_element = self.__get_element(By.ID, self.SEARCHBAR_ID, clickable=True)
+                searchbar_element.click()
+                # endregion
 
-        # Deny the cookies
-        self.__deny_cookies()
+                # Deny the cookies
+                self.__deny_cookies()
 
+                self.__driver_ready = True
+
+            self.__scrape_urls(urls, limit)
+        except BaseException:
+            # The driver may be broken, so it is never reused after an error
+            self.close_driver()
+            raise
+
+        if not self.KEEP_DRIVER:
+            self.close_driver()
+
+        self.__log("=== Finished parsing ===")
+
+    def __scrape_urls(self, urls, limit):
+        """
+        Scrapes the jobs of all provided URLs with an already prepared driver, data is stored in a current_df
+        :param urls: a list of URLs
+        :param limit: a hard limit on how many jobs to fetch
+        """
         df_len_modifier = 0  # It stores how many items are already stored in self.df
         start_time = time.time()  # The time when parsing started after creating self.driver
         full_exec_time = 0  # Time of processing all urls
 
         for url in urls:
-            print(f"== Start scraping through {url} ==")
+            self.__log(f"== Start scraping through {url} ==")
             self.__driver.get(url)
 
             # Wait until the list is loaded and get the number of available jobs
@@ -349,8 +392,8 @@ class KarriereAtScraper:
 
             # Check how many jobs to expect
             total_jobs_expected = int(job_listing_amount) if job_listing_amount.isdigit() else 0
-            print(f"For this search a total of {total_jobs_expected} jobs is expected to be parsed")
-            print("=" * 12)
+            self.__log(f"For this search a total of {total_jobs_expected} jobs is expected to be parsed")
+            self.__log("=" * 12)
 
             # Remove the disruptor pill
             self.__remove_element(By.CLASS_NAME, 'm-alarmDisruptorPill__pill')
@@ -397,12 +440,14 @@ class KarriereAtScraper:
                         self.__current_df.loc[item_counter + df_len_modifier] = data
 
                     except Exception as e:
-                        print("An exception while parsing jobs.", e)
-                        self.__driver.save_screenshot(f"crash_on_{item_counter}.png")
+                        self.__log("An exception while parsing jobs.", e)
+                        # The search in the file name keeps screenshots of different searches apart
+                        search_name = url[len(self.BASE_URL):].strip('/').replace('/', '_')
+                        self.__driver.save_screenshot(f"crash_on_{search_name}_{item_counter}.png")
 
                     item_counter += 1
 
-                print(
+                self.__log(
                     f"{item_counter / total_jobs_expected:.2%} ({item_counter} / {total_jobs_expected} elements)")
 
                 more_available = self.__load_more_jobs(item_counter)
@@ -411,14 +456,10 @@ class KarriereAtScraper:
             cur_exec_time = cur_time - (start_time + full_exec_time)
             full_exec_time = cur_time - start_time
 
-            print("=" * 12)
-            print(
+            self.__log("=" * 12)
+            self.__log(
                 f"Speed: {full_exec_time / max(1, df_len_modifier + item_counter):.2f} sec/elem in general, {cur_exec_time / max(1, item_counter):.2f} sec/elem in current url;")
-            print(f"Full processing time - {full_exec_time} sec, this url processing time - {cur_exec_time} sec.")
-
-        self.__driver.quit()
-
-        print("=== Finished parsing ===")
+            self.__log(f"Full processing time - {full_exec_time} sec, this url processing time - {cur_exec_time} sec.")
 
     def __load_more_jobs(self, item_counter):
         """
@@ -440,5 +481,5 @@ class KarriereAtScraper:
         except (TimeoutException, NoSuchElementException):
             return False
         except Exception as e:
-            print(f"Exception while loading more jobs: {e}")
+            self.__log(f"Exception while loading more jobs: {e}")
             return False
@@ -0,0 +1,282 @@
+import json
+import re
+import time
+
+import pandas as pd
+import pytest
+
+from karriere_at_scraper import KarriereAtScraper
+from karriere_at_scraper import cli
+from karriere_at_scraper.cli import DEFAULTS, build_units, export_results, load_manifest, main, run_manifest
+
+
+class FakeScraper:
+    """Stands in for KarriereAtScraper, every job name maps to the IDs its search finds"""
+    instances = []
+    ids = {}
+    failing = set()
+    search_time = 0
+
+    def __init__(self, *args, **kwargs):
+        self.kwargs = kwargs
+        self.df = pd.DataFrame([], columns=KarriereAtScraper.DF_COLUMNS)
+        self.searches = []
+        self.close_calls = 0
+        FakeScraper.instances.append(self)
+
+    def fetch_jobs(self, jobs_list, locations, remove_duplicates=True, csv_name="", length_limit=9999,
+                   export=True):
+        self.searches.append((jobs_list[0], locations[0]))
+        time.sleep(FakeScraper.search_time)
+        for job_id in FakeScraper.ids.get(jobs_list[0], []):
+            self.df.loc[len(self.df)] = [jobs_list[0], job_id, "", "", locations[0], "", pd.NA, ""]
+        if jobs_list[0] in FakeScraper.failing:
+            raise RuntimeError("session died")
+        return self.df
+
+    def get_df(self):
+        return self.df
+
+    def clear_df(self):
+        self.df = self.df.iloc[0:0]
+
+    def close_driver(self):
+        self.close_calls += 1
+
+
+@pytest.fixture
+def fake_scraper(monkeypatch):
+    monkeypatch.setattr(FakeScraper, "instances", [])
+    monkeypatch.setattr(FakeScraper, "ids", {})
+    monkeypatch.setattr(FakeScraper, "failing", set())
+    monkeypatch.setattr(FakeScraper, "search_time", 0)
+    monkeypatch.setattr(cli, "KarriereAtScraper", FakeScraper)
+    return FakeScraper
+
+
+def make_manifest(searches, **settings):
+    return {**DEFAULTS, "searches": searches, **settings}
+
+
+def write_manifest(tmp_path, manifest, name="manifest.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return str(path)
+
+
+# region build_units
+def test_build_units_expands_jobs_and_locations():
+    units = build_units([{"jobs": ["IT", "Software Entwickler"], "locations": ["Wien", "Graz"]}])
+    assert units == [("IT", "Wien", 9999), ("IT", "Graz", 9999),
+                     ("Software Entwickler", "Wien", 9999), ("Software Entwickler", "Graz", 9999)]
+
+
+def test_build_units_accepts_single_strings():
+    assert build_units([{"jobs": "IT", "locations": "Wien", "limit": 5}]) == [("IT", "Wien", 5)]
+
+
+def test_build_units_removes_duplicates_and_keeps_biggest_limit():
+    units = build_units([
+        {"jobs": ["Software Entwickler"], "locations": ["Wien"], "limit": 5},
+        {"jobs": ["software entwickler"], "locations": ["WIEN", "Graz"], "limit": 50},
+        {"jobs": "Software-Entwickler", "locations": "wien", "limit": 10},
+    ], default_limit=100)
+    assert units == [("Software Entwickler", "Wien", 50), ("software entwickler", "Graz", 50)]
+
+
+def test_build_units_uses_default_limit():
+    assert build_units([{"jobs": "IT", "locations": "Wien"}], default_limit=42) == [("IT", "Wien", 42)]
+# endregion
+
+
+# region load_manifest
+def test_load_manifest_fills_defaults(tmp_path):
+    path = write_manifest(tmp_path, {"workers": 3, "searches": [{"jobs": "IT", "locations": "Wien"}]})
+    manifest = load_manifest(path)
+    assert manifest["workers"] == 3
+    assert manifest["searches"] == [{"jobs": "IT", "locations": "Wien"}]
+    for key in DEFAULTS.keys() - {"workers"}:
+        assert manifest[key] == DEFAULTS[key]
+
+
+def test_load_manifest_reads_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "manifest.yaml"
+    path.write_text("engine: chrome\nsearches:\n  - jobs: [IT]\n    locations: Wien\n    limit: 10\n",
+                    encoding="utf-8")
+    manifest = load_manifest(str(path))
+    assert manifest["engine"] == "chrome"
+    assert manifest["searches"] == [{"jobs": ["IT"], "locations": "Wien", "limit": 10}]
+
+
+@pytest.mark.parametrize("manifest, message", [
+    ({"worker": 2, "searches": [{"jobs": "IT", "locations": "Wien"}]}, "unknown keys: worker"),
+    ({"searches": []}, "non-empty 'searches' list"),
+    ({"searches": [{"jobs": "IT"}]}, "Search #1 .* has no 'locations'"),
+    ({"searches": [{"jobs": [123], "locations": "Wien"}]}, "Search #1 .* 'jobs' as a string"),
+    ({"searches": [{"jobs": "IT", "locations": []}]}, "Search #1 .* 'locations' as a string"),
+    ({"searches": [{"jobs": "IT", "locations": "Wien"}, {"jobs": "IT", "locations": "Graz", "limits": 5}]},
+     "Search #2 .* unknown keys: limits"),
+    ({"searches": [{"jobs": "IT", "locations": "Wien", "limit": 0}]}, "positive integer 'limit'"),
+    ({"workers": "2", "searches": [{"jobs": "IT", "locations": "Wien"}]}, "positive integer 'workers'"),
+    ({"output": 1, "searches": [{"jobs": "IT", "locations": "Wien"}]}, "string 'output'"),
+    ({"output": "jobs.xlsx", "searches": [{"jobs": "IT", "locations": "Wien"}]}, r"\.csv or \.json 'output'"),
+    (["IT", "Wien"], "has to be a mapping"),
+])
+def test_load_manifest_rejects_invalid_manifests(tmp_path, manifest, message):
+    path = write_manifest(tmp_path, manifest)
+    with pytest.raises(ValueError, match=message):
+        load_manifest(path)
+
+
+def test_load_manifest_rejects_invalid_json(tmp_path):
+    path = tmp_path / "manifest.json"
+    path.write_text("{searches: ", encoding="utf-8")
+    with pytest.raises(ValueError, match="not a valid JSON file"):
+        load_manifest(str(path))
+# endregion
+
+
+# region main
+def test_main_reports_manifest_errors(tmp_path, capsys):
+    path = write_manifest(tmp_path, {"searches": [{"jobs": "IT"}]})
+    with pytest.raises(SystemExit) as exit_info:
+        main([path])
+    assert exit_info.value.code == 2
+    assert "has no 'locations'" in capsys.readouterr().err
+
+
+def test_main_dry_run_prints_unique_searches(tmp_path, capsys):
+    path = write_manifest(tmp_path, {"searches": [{"jobs": ["IT", "it"], "locations": "Wien", "limit": 5}]})
+    assert main([path, "--dry-run"]) == 0
+    assert capsys.readouterr().out.splitlines() == ["IT in Wien (limit 5)"]
+# endregion
+
+
+@pytest.mark.parametrize("output, message", [
+    ("missing_dir/jobs.csv", "missing_dir .* does not exist"),
+    ("jobs.xlsx", r"has to be a \.csv or \.json file"),
+])
+def test_main_checks_output_before_scraping(tmp_path, capsys, fake_scraper, output, message):
+    path = write_manifest(tmp_path, {"searches": [{"jobs": "IT", "locations": "Wien"}]})
+    with pytest.raises(SystemExit) as exit_info:
+        main([path, "--output", str(tmp_path / output)])
+    assert exit_info.value.code == 2
+    assert fake_scraper.instances == []
+    assert re.search(message, capsys.readouterr().err)
+
+
+def test_main_exports_results_and_reports_failures(tmp_path, fake_scraper):
+    fake_scraper.ids = {"IT": ["1", "2"], "Data": ["3"]}
+    fake_scraper.failing = {"Data"}
+    output = tmp_path / "jobs.csv"
+    path = write_manifest(tmp_path, {"output": str(output),
+                                     "searches": [{"jobs": ["IT", "Data"], "locations": "Wien"}]})
+
+    assert main([path]) == 1
+    assert sorted(pd.read_csv(output)["ID"]) == [1, 2, 3]
+
+
+def test_main_exports_results_after_interrupt(tmp_path, monkeypatch, fake_scraper):
+    fake_scraper.ids = {"IT": ["1"]}
+    monkeypatch.setattr(cli, "run_manifest", lambda manifest: (
+        pd.DataFrame([["IT", "1", "", "", "Wien", "", pd.NA, ""]], columns=KarriereAtScraper.DF_COLUMNS), 0, True))
+    output = tmp_path / "jobs.json"
+    path = write_manifest(tmp_path, {"output": str(output), "searches": [{"jobs": "IT", "locations": "Wien"}]})
+
+    assert main([path]) == 130
+    assert json.loads(output.read_text(encoding="utf-8"))[0]["ID"] == "1"
+# endregion
+
+
+# region run_manifest
+def test_run_manifest_removes_duplicate_ids_across_searches(fake_scraper):
+    fake_scraper.ids = {"IT": ["1", "2"], "Software Entwickler": ["2", "3"]}
+    manifest = make_manifest([{"jobs": "IT", "locations": "Wien"},
+                              {"jobs": "Software Entwickler", "locations": "Wien"}], workers=2)
+
+    df, failed, interrupted = run_manifest(manifest)
+
+    assert sorted(df["ID"]) == ["1", "2", "3"]
+    assert failed == 0
+    assert not interrupted
+
+
+def test_run_manifest_keeps_duplicates_when_asked(fake_scraper):
+    fake_scraper.ids = {"IT": ["1"], "Data": ["1"]}
+    manifest = make_manifest([{"jobs": ["IT", "Data"], "locations": "Wien"}], remove_duplicates=False)
+
+    df, _, _ = run_manifest(manifest)
+
+    assert df["ID"].tolist() == ["1", "1"]
+
+
+def test_run_manifest_counts_failed_searches_and_keeps_their_jobs(fake_scraper):
+    fake_scraper.ids = {"IT": ["1"], "Data": ["2", "3"]}
+    fake_scraper.failing = {"Data", "Java"}
+    manifest = make_manifest([{"jobs": ["IT", "Data", "Java"], "locations": "Wien"}], workers=2)
+
+    df, failed, _ = run_manifest(manifest)
+
+    assert failed == 2
+    # The jobs a failed search found before its error are kept
+    assert sorted(df["ID"]) == ["1", "2", "3"]
+
+
+def test_run_manifest_closes_every_driver_once(fake_scraper):
+    fake_scraper.failing = {"Data"}
+    manifest = make_manifest([{"jobs": ["IT", "Data", "Java", "Python"], "locations": "Wien"}], workers=2)
+
+    run_manifest(manifest)
+
+    # Failed searches close their driver inside the scraper itself, see test_scraper.py
+    assert [scraper.close_calls for scraper in fake_scraper.instances] == [1, 1]
+    assert all(scraper.kwargs["keep_driver"] for scraper in fake_scraper.instances)
+    assert sum(len(scraper.searches) for scraper in fake_scraper.instances) == 4
+
+
+def test_run_manifest_caps_workers_at_number_of_searches(fake_scraper):
+    manifest = make_manifest([{"jobs": ["IT", "Data"], "locations": "Wien"}], workers=8)
+
+    run_manifest(manifest)
+
+    assert len(fake_scraper.instances) == 2
+    assert [scraper.kwargs["log_prefix"] for scraper in fake_scraper.instances] == ["(worker 1) ", "(worker 2) "]
+
+
+def test_run_manifest_stops_on_interrupt(monkeypatch, fake_scraper):
+    fake_scraper.ids = {"IT": ["1"], "Data": ["2"]}
+    fake_scraper.search_time = 0.1
+    real_as_completed = cli.as_completed
+
+    def interrupted_as_completed(futures):
+        yield next(iter(real_as_completed(futures)))
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(cli, "as_completed", interrupted_as_completed)
+    manifest = make_manifest([{"jobs": ["IT", "Data", "Java", "Python", "C"], "locations": "Wien"}])
+
+    df, failed, interrupted = run_manifest(manifest)
+
+    assert interrupted
+    assert failed == 0
+    assert len(df) == 1
+    # The queued searches were cancelled, not run
+    assert len(fake_scraper.instances[0].searches) < 5
+    assert fake_scraper.instances[0].close_calls == 1
+# endregion
+
+
+# region export_results
+@pytest.mark.parametrize("output", ["jobs.csv", "jobs.json"])
+def test_export_results_writes_empty_results(tmp_path, output):
+    manifest = {**DEFAULTS, "output": str(tmp_path / output), "process_salaries": True,
+                "charts_dir": str(tmp_path / "charts")}
+    df = pd.DataFrame([], columns=KarriereAtScraper.DF_COLUMNS)
+
+    export_results(df, manifest)
+
+    assert (tmp_path / output).exists()
+    assert "Average monthly salary" in df.columns
+    assert not (tmp_path / "charts").exists()
+# endregion
@@ -0,0 +1,38 @@
+import pytest
+
+from karriere_at_scraper import KarriereAtScraper
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_calls = 0
+
+    def get(self, url):
+        raise RuntimeError("session died")
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    scraper = KarriereAtScraper("firefox", "", use_proxy=False, keep_driver=True)
+    scraper.drivers = []
+
+    def create_driver():
+        driver = FakeDriver()
+        scraper.drivers.append(driver)
+        scraper._KarriereAtScraper__driver = driver
+
+    monkeypatch.setattr(scraper, "_KarriereAtScraper__create_driver", create_driver)
+    return scraper
+
+
+def test_kept_driver_is_closed_after_an_error(scraper):
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="session died"):
+            scraper.fetch_jobs(["IT"], ["Wien"], export=False)
+
+    # Every call started a fresh driver and the broken ones were quit
+    assert len(scraper.drivers) == 2
+    assert [driver.quit_calls for driver in scraper.drivers] == [1, 1]